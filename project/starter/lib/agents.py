@@ -1,18 +1,22 @@
-from typing import TypedDict, List, Optional, Union, TypeVar
+from typing import TYPE_CHECKING, TypedDict, List, Optional, Union, TypeVar
 import json
 
 from lib.state_machine import StateMachine, Step, EntryPoint, Termination, Run
 from lib.llm import LLM
 from lib.messages import AIMessage, UserMessage, SystemMessage, ToolMessage
-from lib.tooling import Tool, ToolCall
+from lib.tooling import Tool
 from lib.memory import ShortTermMemory
 
+# Annotation only; importing ToolCall at runtime would load the OpenAI SDK
+if TYPE_CHECKING:
+    from lib.tooling import ToolCall
+
 # Define the state schema
 class AgentState(TypedDict):
     user_query: str  # The current user query being processed
     instructions: str  # System instructions for the agent
     messages: List[dict]  # List of conversation messages
-    current_tool_calls: Optional[List[ToolCall]]  # Current pending tool calls
+    current_tool_calls: Optional[List["ToolCall"]]  # Current pending tool calls
     total_tokens: int  # Track the cumulative total
     
 class Agent:
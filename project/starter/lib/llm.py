@@ -1,6 +1,17 @@
-from typing import List, Optional, Dict, Any
+import asyncio
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from dataclasses import replace
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, List, Optional, Dict, Any, Generator
 from pydantic import BaseModel
-from openai import OpenAI
+try:
+    import orjson
+except ImportError:  # optional, stdlib json is used when it is missing
+    orjson = None
 from lib.messages import (
     AnyMessage,
     TokenUsage,
@@ -10,6 +21,57 @@ from lib.messages import (
 )
 from lib.tooling import Tool
 
+# openai and httpx are slow to import, so they are only loaded once the
+# first LLM is created rather than whenever lib is imported
+if TYPE_CHECKING:
+    import httpx
+    from openai import OpenAI, AsyncOpenAI
+
+
+@lru_cache(maxsize=None)
+def _shared_http() -> "httpx.Client":
+    # One keep-alive connection pool shared by every LLM in the process, so
+    # agents that build an LLM per step don't redo TCP/TLS setup each time
+    import httpx
+    return httpx.Client(
+        limits=httpx.Limits(max_keepalive_connections=32, keepalive_expiry=60),
+    )
+
+
+def _resolve_credentials(base_url: Optional[str], api_key: Optional[str]) -> tuple:
+    # Empty values fall back to the environment, read at LLM construction so
+    # a key loaded later (e.g. load_dotenv) is picked up by new LLMs
+    return (
+        base_url or os.getenv("OPENAI_BASE_URL") or None,
+        api_key or os.getenv("OPENAI_API_KEY") or None,
+    )
+
+
+@lru_cache(maxsize=4)
+def _get_client(base_url: Optional[str], api_key: Optional[str]) -> "OpenAI":
+    # Keyed on resolved credentials, so a changed key gets its own client
+    from openai import OpenAI
+    return OpenAI(base_url=base_url, api_key=api_key, http_client=_shared_http())
+
+
+def _payload_default(obj: Any) -> Any:
+    # response_format is a Pydantic class, key it by its JSON schema. Nothing
+    # else has a faithful JSON form, so such payloads are not cached
+    if isinstance(obj, type) and issubclass(obj, BaseModel):
+        return obj.model_json_schema()
+    raise TypeError(f"Cannot build a cache key from {type(obj).__name__}")
+
+
+# Only short prompts are memoized, so long inputs such as RAG contexts are
+# never pinned in memory for the life of the process
+_WRAP_CACHE_MAX_LEN = 256
+
+
+@lru_cache(maxsize=256)
+def _wrap_str(content: str) -> UserMessage:
+    # Repeated prompts share one (immutable) message and its serialized dict
+    return UserMessage(content=content)
+
 
 class LLM:
     def __init__(
@@ -17,33 +79,70 @@ class LLM:
         model: str = "gpt-4o-mini",
         temperature: float = 0.0,
         tools: Optional[List[Tool]] = None,
-        api_key: Optional[str] = None
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        cache: bool = False,
+        cache_size: int = 1024,
     ):
         self.model = model
         self.temperature = temperature
-        self.client = OpenAI(api_key=api_key) if api_key else OpenAI()
-        self.tools: Dict[str, Tool] = {
+        self._base_url, self._api_key = _resolve_credentials(base_url, api_key)
+        self.client = _get_client(self._base_url, self._api_key)
+        self._aclient: Optional["AsyncOpenAI"] = None
+        self._tools: Dict[str, Tool] = {
             tool.name: tool for tool in (tools or [])
         }
+        self._rebuild_tool_fragment()
+
+        # Exact-match response cache, only consulted at temperature 0
+        self.cache = cache
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, AIMessage]" = OrderedDict()
+
+    @property
+    def aclient(self) -> "AsyncOpenAI":
+        # Created on first async use so sync-only callers don't pay for it
+        if self._aclient is None:
+            from openai import AsyncOpenAI
+            self._aclient = AsyncOpenAI(base_url=self._base_url, api_key=self._api_key)
+        return self._aclient
+
+    @property
+    def tools(self) -> MappingProxyType:
+        # Read-only so the tool set can only change through register_tool /
+        # unregister_tool, which keep the prebuilt payload fragment in sync
+        return MappingProxyType(self._tools)
 
     def register_tool(self, tool: Tool):
-        self.tools[tool.name] = tool
+        self._tools[tool.name] = tool
+        self._rebuild_tool_fragment()
+
+    def unregister_tool(self, name: str):
+        self._tools.pop(name, None)
+        self._rebuild_tool_fragment()
+
+    def _rebuild_tool_fragment(self):
+        # The tools part of the payload only changes with the tool set, so it
+        # is built here instead of on every request. Sorted by name so the
+        # tools prefix is identical no matter the registration order
+        self._tool_payload_fragment: Dict[str, Any] = {
+            "tools": [self._tools[name]._schema_cache for name in sorted(self._tools)],
+            "tool_choice": "auto",
+        } if self._tools else {}
 
     def _build_payload(self, messages: List[BaseMessage]) -> Dict[str, Any]:
         payload = {
             "model": self.model,
             "temperature": self.temperature,
-            "messages": [m.dict() for m in messages],
+            "messages": [m._snapshot() for m in messages],
+            **self._tool_payload_fragment,
         }
-
-        if self.tools:
-            payload["tools"] = [tool.dict() for tool in self.tools.values()]
-            payload["tool_choice"] = "auto"
-
         return payload
 
     def _convert_input(self, input: Any) -> List[BaseMessage]:
         if isinstance(input, str):
+            if len(input) <= _WRAP_CACHE_MAX_LEN:
+                return [_wrap_str(input)]
             return [UserMessage(content=input)]
         elif isinstance(input, BaseMessage):
             return [input]
@@ -59,22 +158,207 @@ class LLM:
         payload = self._build_payload(messages)
         if response_format:
             payload.update({"response_format": response_format})
+
+        key = self._cache_key(payload)
+        cached = self._cache_lookup(key)
+        if cached is not None:
+            return cached
+
+        if response_format:
             response = self.client.beta.chat.completions.parse(**payload)
+            return self._cache_store(key, self._to_ai_message(response))
+        return self._cache_store(key, self._invoke_raw(payload))
+
+    def invoke_n(self,
+                 input: str | BaseMessage | List[BaseMessage],
+                 n: int) -> List[AIMessage]:
+        """
+        Sample `n` candidate completions of the same prompt in one request,
+        sharing a single round trip and prompt prefill.
+        """
+        messages = self._convert_input(input)
+        payload = self._build_payload(messages)
+        response = self.client.chat.completions.create(**payload, n=n)
+        # Usage covers the whole request, so it is reported once on the first
+        # candidate rather than counted again for every choice
+        token_usage = self._token_usage(response.usage)
+        return [
+            AIMessage(
+                content=choice.message.content,
+                tool_calls=choice.message.tool_calls,
+                token_usage=token_usage if i == 0 else None,
+            )
+            for i, choice in enumerate(response.choices)
+        ]
+
+    async def ainvoke(self,
+                      input: str | BaseMessage | List[BaseMessage],
+                      response_format: BaseModel = None,) -> AIMessage:
+        messages = self._convert_input(input)
+        payload = self._build_payload(messages)
+        if response_format:
+            payload.update({"response_format": response_format})
+
+        key = self._cache_key(payload)
+        cached = self._cache_lookup(key)
+        if cached is not None:
+            return cached
+
+        if response_format:
+            response = await self.aclient.beta.chat.completions.parse(**payload)
         else:
-            response = self.client.chat.completions.create(**payload)
-        choice = response.choices[0]
-        message = choice.message
+            response = await self.aclient.chat.completions.create(**payload)
+        return self._cache_store(key, self._to_ai_message(response))
+
+    async def abatch(self,
+                     inputs: List[str | BaseMessage | List[BaseMessage]],
+                     response_format: BaseModel = None,
+                     max_concurrency: int = 16) -> List[AIMessage]:
+        """
+        Run independent inputs concurrently, returning results in input order.
+        At most `max_concurrency` requests are in flight at once.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run_one(input):
+            async with semaphore:
+                return await self.ainvoke(input, response_format)
+
+        return await asyncio.gather(*(run_one(input) for input in inputs))
+
+    def invoke_stream(self,
+                      input: str | BaseMessage | List[BaseMessage],
+                      ) -> Generator[str, None, AIMessage]:
+        """
+        Stream the response, yielding content chunks as they arrive.
 
+        The generator returns the complete AIMessage once the stream ends,
+        so callers can use `message = yield from llm.invoke_stream(...)`.
+        """
+        from lib.tooling import ToolCall
+
+        messages = self._convert_input(input)
+        payload = self._build_payload(messages)
+        stream = self.client.chat.completions.create(
+            **payload,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+
+        content_parts: List[str] = []
+        tool_call_parts: Dict[int, Dict[str, Any]] = {}
         token_usage = None
-        if response.usage:
-            token_usage = TokenUsage(
-                prompt_tokens=response.usage.prompt_tokens,
-                completion_tokens=response.usage.completion_tokens,
-                total_tokens=response.usage.total_tokens
+        for chunk in stream:
+            if chunk.usage:
+                token_usage = self._token_usage(chunk.usage)
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta.content:
+                content_parts.append(delta.content)
+                yield delta.content
+
+            # Tool calls arrive as fragments keyed by index, merge them back
+            for call in delta.tool_calls or []:
+                part = tool_call_parts.setdefault(
+                    call.index, {"id": None, "name": "", "arguments": ""}
+                )
+                if call.id:
+                    part["id"] = call.id
+                if call.function and call.function.name:
+                    part["name"] += call.function.name
+                if call.function and call.function.arguments:
+                    part["arguments"] += call.function.arguments
+
+        tool_calls = [
+            ToolCall(
+                id=part["id"],
+                type="function",
+                function={"name": part["name"], "arguments": part["arguments"]},
             )
+            for _, part in sorted(tool_call_parts.items())
+        ]
 
+        return AIMessage(
+            content="".join(content_parts) if content_parts else None,
+            tool_calls=tool_calls or None,
+            token_usage=token_usage,
+        )
+
+    def _cache_key(self, payload: Dict[str, Any]) -> Optional[bytes]:
+        # Sampling at temperature > 0 is not repeatable, so it is never cached
+        if not self.cache or self.temperature != 0.0:
+            return None
+        try:
+            encoded = json.dumps(payload, sort_keys=True, default=_payload_default)
+        except (TypeError, ValueError):
+            return None
+        return hashlib.blake2b(encoded.encode(), digest_size=16).digest()
+
+    def _cache_lookup(self, key: Optional[bytes]) -> Optional[AIMessage]:
+        if key is None or key not in self._cache:
+            return None
+        self._cache.move_to_end(key)
+        # A hit spends no tokens, so don't report the original usage again
+        return replace(self._cache[key], token_usage=None)
+
+    def _cache_store(self, key: Optional[bytes], message: AIMessage) -> AIMessage:
+        if key is not None:
+            # Keep a private copy so callers reassigning fields on their
+            # response can't change what later hits return
+            self._cache[key] = replace(message)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return message
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def _invoke_raw(self, payload: Dict[str, Any]) -> AIMessage:
+        """
+        Send the payload as a single pre-encoded body instead of letting the
+        SDK re-serialize it. The request still goes through the SDK client,
+        so its retries, timeouts and exception types apply unchanged.
+        """
+        from lib.tooling import ToolCall
+
+        body = orjson.dumps(payload) if orjson else json.dumps(payload).encode()
+        raw = self.client.post(
+            "/chat/completions",
+            cast_to=bytes,
+            content=body,
+            options={"headers": {"Content-Type": "application/json"}},
+        )
+
+        data = orjson.loads(raw) if orjson else json.loads(raw)
+        message = data["choices"][0]["message"]
+        usage = data.get("usage")
+        return AIMessage(
+            content=message.get("content"),
+            tool_calls=[
+                ToolCall.model_validate(call) for call in message["tool_calls"]
+            ] if message.get("tool_calls") else None,
+            token_usage=TokenUsage(
+                prompt_tokens=usage["prompt_tokens"],
+                completion_tokens=usage["completion_tokens"],
+                total_tokens=usage["total_tokens"],
+            ) if usage else None,
+        )
+
+    def _to_ai_message(self, response: Any) -> AIMessage:
+        message = response.choices[0].message
         return AIMessage(
             content=message.content,
             tool_calls=message.tool_calls,
-            token_usage=token_usage
+            token_usage=self._token_usage(response.usage),
+        )
+
+    @staticmethod
+    def _token_usage(usage: Any) -> Optional[TokenUsage]:
+        if not usage:
+            return None
+        return TokenUsage(
+            prompt_tokens=usage.prompt_tokens,
+            completion_tokens=usage.completion_tokens,
+            total_tokens=usage.total_tokens
         )
@@ -1,43 +1,106 @@
-from pydantic import BaseModel
-from typing import Optional, Union, List, Dict, Literal
-
-from lib.tooling import ToolCall
-
-
-class BaseMessage(BaseModel):
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Optional, Union, List, Dict
+
+if TYPE_CHECKING:
+    from lib.tooling import ToolCall
+
+
+def _to_builtins(value: Any) -> Any:
+    """
+    Convert a message field into plain JSON values. Containers are always
+    copied so the snapshot never aliases the message's own lists or dicts
+    """
+    if isinstance(value, (list, tuple)):
+        return [_to_builtins(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _to_builtins(item) for key, item in value.items()}
+    if hasattr(value, "model_dump"):
+        return value.model_dump(exclude_none=True)
+    return value
+
+
+@lru_cache(maxsize=None)
+def _payload_fields(cls: type) -> tuple:
+    """Names of the fields a message class sends to the API, in order"""
+    return tuple(
+        f.name for f in fields(cls)
+        if f.init and f.metadata.get("payload", True)
+    )
+
+
+@dataclass(slots=True, kw_only=True)
+class BaseMessage:
+    """
+    Messages are treated as immutable once created. Reassigning a field
+    refreshes the serialized snapshot, but changing a field in place (e.g.
+    `msg.tool_calls.append(...)`) is not detected: build a new message instead.
+    """
     role: str
     content: Optional[str] = ""
 
+    # Serialized snapshot reused across turns; reset whenever a field changes
+    _cached_dict: Optional[Dict] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name != "_cached_dict":
+            object.__setattr__(self, "_cached_dict", None)
+
+    def _snapshot(self) -> Dict:
+        # Only API fields are emitted; unset optional fields are omitted and
+        # nested SDK models are flattened once so the cached dict is final.
+        # Internal callers (LLM payloads) must treat it as read-only
+        if self._cached_dict is None:
+            self._cached_dict = {
+                name: _to_builtins(value)
+                for name in _payload_fields(type(self))
+                if (value := getattr(self, name)) is not None or name == "content"
+            }
+        return self._cached_dict
+
     def dict(self) -> Dict:
-        return dict(self)
+        # Hand out a deep copy of the containers so callers editing the
+        # payload (including nested tool_calls) can't corrupt the snapshot
+        # that later requests reuse
+        return _to_builtins(self._snapshot())
 
 
+@dataclass(slots=True, kw_only=True)
 class SystemMessage(BaseMessage):
-    role: Literal["system"] = "system"
+    role: str = "system"
 
 
+@dataclass(slots=True, kw_only=True)
 class UserMessage(BaseMessage):
-    role: Literal["user"] = "user"
+    role: str = "user"
 
 
+@dataclass(slots=True, kw_only=True)
 class ToolMessage(BaseMessage):
-    role: Literal["tool"] = "tool"
+    role: str = "tool"
     tool_call_id: str
     name: str
     content: str = ""
 
 
-class TokenUsage(BaseModel):
+@dataclass(slots=True)
+class TokenUsage:
     prompt_tokens: int = 0
     completion_tokens: int = 0
     total_tokens: int = 0
 
 
+@dataclass(slots=True, kw_only=True)
 class AIMessage(BaseMessage):
-    role: Literal["assistant"] = "assistant"
+    role: str = "assistant"
     content: Optional[str] = ""
-    tool_calls: Optional[List[ToolCall]] = None
-    token_usage: Optional[TokenUsage] = None
+    tool_calls: Optional[List["ToolCall"]] = None
+    token_usage: Optional[TokenUsage] = field(
+        default=None, metadata={"payload": False}
+    )
 
 
 AnyMessage = Union[
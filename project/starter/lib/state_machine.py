@@ -1,4 +1,4 @@
-from typing import Any, Callable, Dict, List, Optional, Union, TypeVar, Generic, cast, Type, TypedDict, get_type_hints
+from typing import Any, Callable, Dict, List, Optional, Union, TypeVar, Generic, cast, Type, TypedDict
 from dataclasses import dataclass, field
 from datetime import datetime
 import uuid
@@ -45,8 +45,9 @@ class Step(Generic[StateSchema]):
                 f"Step '{self.step_id}' logic function must accept either 1 argument (state) "
                 f"or 2 arguments (state, resource). Found {self.logic_params_count} arguments."
             ) 
-        # Get expected fields from the TypedDict
-        expected_fields = get_type_hints(state_schema)
+        # Get expected fields from the TypedDict. Only the names are needed, so
+        # read __annotations__ rather than resolving every type on each step
+        expected_fields = state_schema.__annotations__
         
         # Create new state with all fields from state_schema
         # Only copy fields that are defined in state_schema
@@ -1,88 +1,158 @@
+import copy
 import inspect
-import datetime
+import json
+import time
+from collections import OrderedDict
 from typing import (
-    Any, Callable, 
+    TYPE_CHECKING, Any, Callable, 
     Literal, Optional, Union, TypeAlias,
     get_type_hints, get_origin, get_args,
 )
-from functools import wraps
-from openai.types.chat.chat_completion_message_tool_call import ChatCompletionMessageToolCall
+from functools import lru_cache
 
+if TYPE_CHECKING:
+    from openai.types.chat.chat_completion_message_tool_call import ChatCompletionMessageToolCall
+
+    # Type alias for OpenAI's tool call implementation
+    ToolCall: TypeAlias = ChatCompletionMessageToolCall
+
+
+def __getattr__(name: str) -> Any:
+    # The OpenAI SDK is slow to import, so ToolCall is resolved on first use
+    if name == "ToolCall":
+        from openai.types.chat.chat_completion_message_tool_call import ChatCompletionMessageToolCall
+        globals()["ToolCall"] = ChatCompletionMessageToolCall
+        return ChatCompletionMessageToolCall
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Primitive mappings, anything else (dates, datetimes, ...) is sent as a string
+_PRIMITIVE_TYPES = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+}
+
+
+_SCALAR_TYPES = (type(None), bool, int, float, str)
+
+
+def _canonical(value: Any) -> Any:
+    """
+    Type-tagged, order-independent form of a tool argument, so values that
+    JSON would conflate ({1: "a"} vs {"1": "a"}, (1, 2) vs [1, 2]) never
+    share a cache key. Raises TypeError for anything else.
+    """
+    kind = type(value)
+    if kind in _SCALAR_TYPES:
+        return [kind.__name__, value]
+    if kind is list or kind is tuple:
+        return [kind.__name__, [_canonical(item) for item in value]]
+    if kind is dict:
+        items = [[_canonical(key), _canonical(item)] for key, item in value.items()]
+        items.sort(key=lambda pair: json.dumps(pair[0]))
+        return ["dict", items]
+    raise TypeError(f"Cannot build a cache key from {kind.__name__}")
+
+
+@lru_cache(maxsize=None)
+def _get_type_hints(func: Callable) -> dict:
+    return get_type_hints(func)
+
+
+# Types are hashable, so each annotation is reflected on once per process
+@lru_cache(maxsize=None)
+def _infer_json_schema_type(typ: Any) -> dict:
+    origin = get_origin(typ)
+
+    # Handle Literal (enums)
+    if origin is Literal:
+        return {
+            "type": "string",
+            "enum": list(get_args(typ))
+        }
+
+    # Handle Optional[T]
+    if origin is Union:
+        args = get_args(typ)
+        non_none = [arg for arg in args if arg is not type(None)]
+        if len(non_none) == 1:
+            return _infer_json_schema_type(non_none[0])
+        return {"type": "string"}  # fallback
+
+    # Handle collections
+    if origin is list:
+        return {
+            "type": "array",
+            "items": _infer_json_schema_type(get_args(typ)[0] if get_args(typ) else str)
+        }
+
+    if origin is dict:
+        return {
+            "type": "object",
+            "additionalProperties": _infer_json_schema_type(get_args(typ)[1] if get_args(typ) else str)
+        }
+
+    return {"type": _PRIMITIVE_TYPES.get(typ, "string")}
 
-# Type alias for OpenAI's tool call implementation
-ToolCall: TypeAlias = ChatCompletionMessageToolCall
 
 class Tool:
+    # Large tool catalogs keep one instance per tool; slots avoid a __dict__ each
+    __slots__ = (
+        "func", "name", "description", "signature", "type_hints", "parameters",
+        "_properties", "_required", "_schema_cache",
+        "cache", "ttl", "cache_size", "_out_cache",
+    )
+
     def __init__(
         self,
         func: Callable,
         name: Optional[str] = None,
-        description: Optional[str] = None
+        description: Optional[str] = None,
+        cache: bool = False,
+        ttl: Optional[float] = None,
+        cache_size: int = 256,
     ):
         self.func = func
         self.name = name or func.__name__
         self.description = description or inspect.getdoc(func)
-        self.signature = inspect.signature(func, eval_str=True)
-        self.type_hints = get_type_hints(func)
+        # Annotations are resolved once by get_type_hints; the signature is
+        # only needed for names, defaults and binding
+        self.signature = inspect.signature(func)
+        self.type_hints = _get_type_hints(func)
 
         self.parameters = [
             self._build_param_schema(key, param)
             for key, param in self.signature.parameters.items()
         ]
+        self._properties = {
+            param["name"]: param["schema"] for param in self.parameters
+        }
+        self._required = [
+            param["name"] for param in self.parameters if param["required"]
+        ]
+        # The schema is fixed once the tool is built, so serialize it only once
+        self._schema_cache = self._build_schema_dict()
+
+        # Memoized results for pure tools, keyed by canonicalized arguments
+        self.cache = cache
+        self.ttl = ttl
+        self.cache_size = cache_size
+        self._out_cache: "OrderedDict[tuple, tuple[float, Any]]" = OrderedDict()
 
     def _build_param_schema(self, name: str, param: inspect.Parameter):
         param_type = self.type_hints.get(name, str)
-        schema = self._infer_json_schema_type(param_type)
+        # The memoized schema is shared by every parameter with this
+        # annotation, so each parameter gets its own copy
+        schema = copy.deepcopy(_infer_json_schema_type(param_type))
         return {
             "name": name,
             "schema": schema,
-            "required": param.default == inspect.Parameter.empty
-        }
-
-    def _infer_json_schema_type(self, typ: Any) -> dict:
-        origin = get_origin(typ)
-
-        # Handle Literal (enums)
-        if origin is Literal:
-            return {
-                "type": "string",
-                "enum": list(get_args(typ))
-            }
-
-        # Handle Optional[T]
-        if origin is Union:
-            args = get_args(typ)
-            non_none = [arg for arg in args if arg is not type(None)]
-            if len(non_none) == 1:
-                return self._infer_json_schema_type(non_none[0])
-            return {"type": "string"}  # fallback
-
-        # Handle collections
-        if origin is list:
-            return {
-                "type": "array",
-                "items": self._infer_json_schema_type(get_args(typ)[0] if get_args(typ) else str)
-            }
-
-        if origin is dict:
-            return {
-                "type": "object",
-                "additionalProperties": self._infer_json_schema_type(get_args(typ)[1] if get_args(typ) else str)
-            }
-
-        # Primitive mappings
-        mapping = {
-            str: "string",
-            int: "integer",
-            float: "number",
-            bool: "boolean",
-            datetime.date: "string",
-            datetime.datetime: "string",
+            "required": param.default is inspect.Parameter.empty
         }
 
-        return {"type": mapping.get(typ, "string")}
-
-    def dict(self) -> dict:
+    def _build_schema_dict(self) -> dict:
         return {
             "type": "function",
             "function": {
@@ -90,20 +160,54 @@ class Tool:
                 "description": self.description,
                 "parameters": {
                     "type": "object",
-                    "properties": {
-                        param["name"]: param["schema"]
-                        for param in self.parameters
-                    },
-                    "required": [
-                        param["name"] for param in self.parameters if param["required"]
-                    ],
+                    "properties": self._properties,
+                    "required": self._required,
                     "additionalProperties": False
                 }
             }
         }
 
+    def dict(self) -> dict:
+        # The cache is shared with every LLM payload using this tool, so
+        # callers get their own copy to edit
+        return copy.deepcopy(self._schema_cache)
+
     def __call__(self, *args, **kwargs):
-        return self.func(*args, **kwargs)
+        if not self.cache:
+            return self.func(*args, **kwargs)
+
+        key = self._cache_key(args, kwargs)
+        if key is None:
+            return self.func(*args, **kwargs)
+
+        hit = self._out_cache.get(key)
+        if hit is not None:
+            if self.ttl is None or time.monotonic() - hit[0] < self.ttl:
+                self._out_cache.move_to_end(key)
+                return hit[1]
+            del self._out_cache[key]
+
+        result = self.func(*args, **kwargs)
+        self._out_cache[key] = (time.monotonic(), result)
+        if len(self._out_cache) > self.cache_size:
+            self._out_cache.popitem(last=False)
+        return result
+
+    def _cache_key(self, args: tuple, kwargs: dict) -> Optional[tuple]:
+        # Bind to the signature so f(1), f(a=1) and f() with default a=1
+        # all map to the same entry. Arguments that don't bind or aren't
+        # plain JSON-like values can't be keyed reliably, so those calls
+        # skip the cache
+        try:
+            bound = self.signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            canonical = json.dumps(_canonical(bound.arguments))
+        except (TypeError, ValueError):
+            return None
+        return (self.name, canonical)
+
+    def clear_cache(self):
+        self._out_cache.clear()
 
     def __repr__(self):
         return f"<Tool name={self.name} params={[p['name'] for p in self.parameters]}>"
@@ -114,12 +218,12 @@ class Tool:
 
 
 
-def tool(func=None, *, name: str = None, description: str = None):
+def tool(func=None, *, name: str = None, description: str = None,
+         cache: bool = False, ttl: Optional[float] = None,
+         cache_size: int = 256):
     def wrapper(f):
-        @wraps(f)
-        def wrapped(*args, **kwargs):
-            return f(*args, **kwargs)
-        return Tool(f, name=name, description=description)
+        return Tool(f, name=name, description=description, cache=cache, ttl=ttl,
+                    cache_size=cache_size)
     
     # @tool ou @tool(name="foo")
     return wrapper(func) if func else wrapper
\ No newline at end of file